@@ -1,7 +1,8 @@
 """
 Board routing configuration for mapping request types to Trello boards.
 """
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 # Board routing configuration
 # Maps request types to their corresponding Trello board IDs
@@ -28,6 +29,27 @@ BOARD_ROUTING: Dict[str, Dict[str, str]] = {
     }
 }
 
+# Read-only view handed out by get_all_boards
+_BOARD_ROUTING_VIEW: Mapping[str, Dict[str, str]] = MappingProxyType(BOARD_ROUTING)
+
+# Reverse index for resolving a board ID to its display name
+BOARD_ID_TO_NAME: Dict[str, str] = {
+    board_config["board_id"]: board_config["board_name"]
+    for board_config in BOARD_ROUTING.values()
+}
+
+# Board routing instructions appended to the system prompt
+ROUTING_PROMPT_BLOCK: str = (
+    "BOARD ROUTING:\n"
+    "When creating tickets, you MUST use the correct board_id based on the request type:\n\n"
+    + "".join(
+        f"- {request_type}: board_id=\"{board_config['board_id']}\" ({board_config['board_name']})\n"
+        for request_type, board_config in BOARD_ROUTING.items()
+    )
+    + "\nIMPORTANT: Always include the board_id parameter when calling create_trello_card "
+    "to ensure tickets are created on the correct board."
+)
+
 
 def get_board_for_request_type(request_type: Optional[str]) -> Optional[str]:
     """
@@ -69,11 +91,11 @@ def get_board_name_for_request_type(request_type: Optional[str]) -> Optional[str
     return None
 
 
-def get_all_boards() -> Dict[str, Dict[str, str]]:
+def get_all_boards() -> Mapping[str, Dict[str, str]]:
     """
     Get all board routing configurations.
 
     Returns:
-        Dictionary of all board routing configurations
+        Read-only mapping of all board routing configurations
     """
-    return BOARD_ROUTING.copy()
+    return _BOARD_ROUTING_VIEW
@@ -1,27 +1,68 @@
 """
 Claude API service for handling conversations and tool use.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Sequence
+import asyncio
 import logging
-import json
-from anthropic import Anthropic
+import time
+from anthropic import AsyncAnthropic, BadRequestError
+from mcp.types import TextContent
 from config import settings
 from mcp_client import mcp_client
 from prompt_manager import prompt_manager
-from board_config import get_board_for_request_type, get_all_boards
+from board_config import BOARD_ID_TO_NAME, ROUTING_PROMPT_BLOCK
 from models import ToolCall
+import json_utils
+from response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between liveness pings of the MCP server from the chat path
+MCP_PING_INTERVAL_SECONDS = 30.0
+
 
 class ClaudeService:
     """Service for interacting with Claude API."""
 
+    # Tools that modify Trello and lock the chat once executed.
+    # Empty - don't auto-lock after ticket creation (allows multi-ticket conversations)
+    ACTION_TOOL_NAMES: frozenset = frozenset()
+
+    # Tools that change Trello; turns calling them are never served from or stored in the response caches
+    MUTATING_TOOL_NAMES: frozenset = frozenset({"create_trello_card"})
+
+    # Server-side code execution tool that may call MCP tools programmatically
+    CODE_EXECUTION_TOOL_TYPE = "code_execution_20250825"
+
+    # Content blocks that only the programmatic tool calling beta accepts
+    PROGRAMMATIC_BLOCK_TYPES = frozenset({
+        "server_tool_use",
+        "code_execution_tool_result",
+        "bash_code_execution_tool_result",
+        "text_editor_code_execution_tool_result"
+    })
+
     def __init__(self):
         """Initialize the Claude service."""
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
+        self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
         self.model = settings.claude_model
         self.max_tokens = settings.claude_max_tokens
+        self._programmatic_tools_enabled = settings.claude_programmatic_tool_calling
+        # Response caches live in this process, so a card created through another worker
+        # can't clear them. With shared (Redis) sessions they are turned off instead of
+        # replaying answers that may miss that card.
+        cache_size = 0 if settings.redis_url else settings.response_cache_size
+        if settings.redis_url:
+            logger.info("Response caches disabled: REDIS_URL is set and caches are per process")
+        self._exact_cache = ResponseCache(
+            max_size=cache_size,
+            ttl_seconds=settings.response_cache_ttl_seconds
+        )
+        self._opening_cache = ResponseCache(
+            max_size=cache_size if settings.opening_message_cache else 0,
+            ttl_seconds=settings.response_cache_ttl_seconds
+        )
+        self._last_mcp_ping_ts = 0.0
 
     async def process_message(
         self,
@@ -34,16 +75,12 @@ class ClaudeService:
 
         Args:
             user_message: The user's message
-            conversation_history: Previous conversation messages
+            conversation_history: Previous conversation messages (extended in place with this turn)
             request_type: Optional request type for specialized prompts
 
         Returns:
             Dictionary with response message and tool calls made
         """
-        # Ensure MCP client is connected
-        if not await mcp_client.health_check():
-            raise Exception("MCP server not available")
-
         # Get system prompt
         system_prompt = prompt_manager.get_system_prompt(request_type)
 
@@ -51,11 +88,51 @@ class ClaudeService:
         board_routing_info = self._get_board_routing_info()
         system_prompt = f"{system_prompt}\n\n{board_routing_info}"
 
-        # Build messages array with conversation history + new message
-        messages = conversation_history.copy()
+        # Replay the stored response if this exact conversation was seen before
+        cache_key = ResponseCache.make_key(system_prompt, conversation_history, user_message)
+        cached_response = self._exact_cache.get(cache_key)
+        if cached_response is not None:
+            logger.info("Returning cached response (exact match)")
+            return {
+                **cached_response,
+                "updated_history": list(cached_response["updated_history"])
+            }
+
+        # Opening messages carry no context, so rewordings that only differ in case,
+        # punctuation or spacing can share a response
+        opening_key = None
+        if not conversation_history:
+            opening_key = ResponseCache.make_message_key(request_type, user_message)
+        if opening_key is not None:
+            cached_response = self._opening_cache.get(opening_key)
+            if cached_response is not None:
+                logger.info("Returning cached response (normalized match)")
+                return {
+                    **cached_response,
+                    "updated_history": [
+                        {"role": "user", "content": user_message},
+                        *cached_response["updated_history"][1:]
+                    ]
+                }
+
+        # Ensure MCP client is connected
+        if not await self._ensure_mcp_available():
+            raise Exception("MCP server not available")
+
+        # Append this turn to the session's history in place; on failure the turn is
+        # rolled back so the stored history never ends with a half-finished exchange
+        messages = conversation_history
+        history_length = len(messages)
         messages.append({"role": "user", "content": user_message})
 
-        # Get tool definitions
+        # System prompt as a cacheable block so Claude reuses it across the tool loop
+        system_blocks = [{
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"}
+        }]
+
+        # Get tool definitions (already marked for prompt caching)
         tools = mcp_client.get_tools()
 
         # Track tool calls made
@@ -66,24 +143,38 @@ class ClaudeService:
 
         # Track if any action-requiring tools were executed (tools that modify Trello)
         action_tools_executed = False
-        action_tool_names = set()  # Empty set - don't auto-lock after ticket creation (allows multi-ticket conversations)
+        action_tool_names = self.ACTION_TOOL_NAMES
+
+        # Track if any mutating tool was called, whether or not it succeeded
+        mutating_tools_called = False
 
         # Tool execution loop
         max_iterations = 10  # Prevent infinite loops
         iteration = 0
 
-        while iteration < max_iterations:
-            iteration += 1
+        # Code execution container reused across iterations for programmatic tool calls
+        container_id: Optional[str] = None
 
-            try:
-                # Call Claude API
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    system=system_prompt,
-                    messages=messages,
-                    tools=tools if tools else None
-                )
+        # Tool executions started while Claude's response is still streaming
+        tool_tasks: List[asyncio.Task] = []
+
+        try:
+            while iteration < max_iterations:
+                iteration += 1
+                tool_tasks = []
+
+                def dispatch_tool(tool_use: Any) -> None:
+                    logger.info(f"Tool requested: {tool_use.name}")
+                    tool_tasks.append(asyncio.create_task(
+                        mcp_client.execute_tool(tool_use.name, tool_use.input)
+                    ))
+
+                # Call Claude API, dispatching each tool call as soon as its block completes
+                response = await self._stream_message(system_blocks, messages, tools, container_id, dispatch_tool)
+
+                container = getattr(response, "container", None)
+                if container is not None:
+                    container_id = container.id
 
                 # Check if response contains tool use
                 tool_use_blocks = [
@@ -91,6 +182,14 @@ class ClaudeService:
                     if block.type == "tool_use"
                 ]
 
+                if not tool_use_blocks and response.stop_reason == "pause_turn":
+                    # Server-side code execution paused mid-turn; let Claude resume it
+                    messages.append({
+                        "role": "assistant",
+                        "content": response.content
+                    })
+                    continue
+
                 if not tool_use_blocks:
                     # No more tool calls, we have the final response
                     final_text = "".join([
@@ -107,7 +206,7 @@ class ClaudeService:
                     logger.info(f"Conversation completed in {iteration} iterations")
                     logger.info(f"Returning created_tickets: {created_tickets}")
 
-                    return {
+                    result = {
                         "message": final_text,
                         "tool_calls": tool_calls_made,
                         "created_tickets": created_tickets,
@@ -115,22 +214,41 @@ class ClaudeService:
                         "updated_history": messages
                     }
 
-                # Execute tool calls
+                    # Only cache read-only turns - mutating actions (even failed ones) must not be replayed
+                    if not mutating_tools_called and not action_tools_executed:
+                        # Store a snapshot, later turns keep appending to messages
+                        cached_result = {**result, "updated_history": list(messages)}
+                        self._exact_cache.set(cache_key, cached_result)
+                        if opening_key is not None:
+                            self._opening_cache.set(opening_key, cached_result)
+
+                    return result
+
+                # Wait for the concurrently running tool calls, results are in request order
+                results = await asyncio.gather(*tool_tasks, return_exceptions=True)
+
                 tool_results = []
-                for tool_use in tool_use_blocks:
+                for tool_use, result in zip(tool_use_blocks, results):
                     tool_name = tool_use.name
                     tool_input = tool_use.input
 
-                    logger.info(f"Tool requested: {tool_name}")
+                    if tool_name in self.MUTATING_TOOL_NAMES:
+                        mutating_tools_called = True
 
                     try:
-                        # Execute tool via MCP
-                        result = await mcp_client.execute_tool(tool_name, tool_input)
+                        # Surface tool failures through the shared error handling below
+                        if isinstance(result, Exception):
+                            raise result
 
                         # Check if this is an action tool that was successfully executed
                         if tool_name in action_tool_names:
                             action_tools_executed = True
 
+                        # Trello changed, so cached answers about it may be stale (this process only)
+                        if tool_name in self.MUTATING_TOOL_NAMES:
+                            self._exact_cache.clear()
+                            self._opening_cache.clear()
+
                         # Track created tickets
                         if tool_name == "create_trello_card":
                             logger.info(f"create_trello_card called with input: {tool_input}")
@@ -185,9 +303,14 @@ class ClaudeService:
 
                 # Continue loop to get Claude's response to the tool results
 
-            except Exception as e:
-                logger.error(f"Error in Claude API call: {e}")
-                raise
+        except BaseException as e:
+            # BaseException so cancellation (client disconnect, shutdown) also rolls back:
+            # the stored history must never end with a bare user turn or an unanswered tool_use
+            logger.error(f"Error in Claude API call: {e!r}")
+            for task in tool_tasks:
+                task.cancel()
+            del messages[history_length:]
+            raise
 
         # If we hit max iterations, return what we have
         logger.warning(f"Reached max iterations ({max_iterations})")
@@ -200,24 +323,154 @@ class ClaudeService:
             "error": "Max iterations reached"
         }
 
-    def _get_board_routing_info(self) -> str:
+    async def _stream_message(
+        self,
+        system_blocks: List[Dict[str, Any]],
+        messages: List[Dict[str, Any]],
+        tools: Sequence[Dict[str, Any]],
+        container_id: Optional[str],
+        on_tool_use: Callable[[Any], None]
+    ) -> Any:
         """
-        Generate board routing information to include in system prompt.
+        Stream a Claude API response, using programmatic tool calling when enabled.
+
+        With programmatic tool calling, Claude may write code that runs in Anthropic's
+        code execution sandbox and calls several MCP tools in one go; each call still
+        arrives as a tool_use block, so the regular tool loop answers it.
+
+        Args:
+            system_blocks: System prompt blocks
+            messages: Conversation messages
+            tools: Tool definitions in Claude format
+            container_id: Code execution container from a previous iteration, if any
+            on_tool_use: Called with each tool_use block as soon as it has fully streamed
 
         Returns:
-            Formatted string with board routing instructions
+            Final Claude API response message
+        """
+        if self._programmatic_tools_enabled and tools:
+            extra_args = {"container": container_id} if container_id else {}
+            try:
+                return await self._consume_stream(
+                    self.client.beta.messages.stream(
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        system=system_blocks,
+                        messages=messages,
+                        tools=self._get_programmatic_tools(tools),
+                        betas=[settings.claude_programmatic_tool_beta],
+                        **extra_args
+                    ),
+                    on_tool_use
+                )
+            except BadRequestError as e:
+                # Only fall back when the beta itself was rejected, and only while the
+                # conversation holds no blocks the standard endpoint would refuse
+                if (
+                    container_id
+                    or not self._is_unsupported_beta_error(e)
+                    or self._has_programmatic_blocks(messages)
+                ):
+                    raise
+                logger.warning(f"Programmatic tool calling unavailable, falling back to standard tool use: {e}")
+                self._programmatic_tools_enabled = False
+
+        return await self._consume_stream(
+            self.client.messages.stream(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                system=system_blocks,
+                messages=messages,
+                tools=tools if tools else None
+            ),
+            on_tool_use
+        )
+
+    def _is_unsupported_beta_error(self, error: BadRequestError) -> bool:
         """
-        boards = get_all_boards()
+        Check whether a rejected request failed because of the programmatic tool calling beta.
 
-        routing_info = "BOARD ROUTING:\n"
-        routing_info += "When creating tickets, you MUST use the correct board_id based on the request type:\n\n"
+        Args:
+            error: Error returned by the Claude API
 
-        for request_type, board_config in boards.items():
-            routing_info += f"- {request_type}: board_id=\"{board_config['board_id']}\" ({board_config['board_name']})\n"
+        Returns:
+            True if the error names the beta or the code execution tool
+        """
+        message = str(error)
+        return (
+            settings.claude_programmatic_tool_beta in message
+            or self.CODE_EXECUTION_TOOL_TYPE in message
+            or "allowed_callers" in message
+        )
+
+    @classmethod
+    def _has_programmatic_blocks(cls, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether a conversation holds content that requires the programmatic tool calling beta.
 
-        routing_info += "\nIMPORTANT: Always include the board_id parameter when calling create_trello_card to ensure tickets are created on the correct board."
+        Args:
+            messages: Conversation messages (content blocks may be SDK objects or dicts)
 
-        return routing_info
+        Returns:
+            True if any message has a code execution block or a tool call made from code
+        """
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str):
+                continue
+            for block in content:
+                if isinstance(block, dict):
+                    block_type, caller = block.get("type"), block.get("caller")
+                else:
+                    block_type, caller = getattr(block, "type", None), getattr(block, "caller", None)
+                if block_type in cls.PROGRAMMATIC_BLOCK_TYPES:
+                    return True
+                if block_type == "tool_use" and caller:
+                    caller_type = caller.get("type") if isinstance(caller, dict) else getattr(caller, "type", None)
+                    if caller_type != "direct":
+                        return True
+        return False
+
+    async def _consume_stream(self, stream_manager: Any, on_tool_use: Callable[[Any], None]) -> Any:
+        """
+        Read a response stream to completion, reporting finished tool_use blocks.
+
+        Args:
+            stream_manager: Stream context manager returned by the Anthropic client
+            on_tool_use: Called with each tool_use block as soon as it has fully streamed
+
+        Returns:
+            Final Claude API response message
+        """
+        async with stream_manager as stream:
+            async for event in stream:
+                if event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                    on_tool_use(event.content_block)
+            return await stream.get_final_message()
+
+    def _get_programmatic_tools(self, tools: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Expose MCP tools to Claude's code execution tool.
+
+        Args:
+            tools: Tool definitions in Claude format
+
+        Returns:
+            Code execution tool followed by the MCP tools marked as callable from code
+        """
+        return [
+            {"type": self.CODE_EXECUTION_TOOL_TYPE, "name": "code_execution"},
+            *({**tool, "allowed_callers": [self.CODE_EXECUTION_TOOL_TYPE]} for tool in tools)
+        ]
+
+    def _get_board_routing_info(self) -> str:
+        """
+        Get board routing information to include in system prompt.
+
+        Returns:
+            Formatted string with board routing instructions
+        """
+        return ROUTING_PROMPT_BLOCK
 
     def _extract_ticket_info(self, result: Any, tool_input: Dict[str, Any]) -> Optional[Dict[str, str]]:
         """
@@ -237,10 +490,10 @@ class ClaudeService:
                 # Extract text from ContentBlock objects
                 for item in result:
                     if hasattr(item, 'text'):
-                        result_dict = json.loads(item.text)
+                        result_dict = json_utils.loads(item.text)
                         break
             elif isinstance(result, str):
-                result_dict = json.loads(result)
+                result_dict = json_utils.loads(result)
             elif isinstance(result, dict):
                 result_dict = result
             else:
@@ -254,11 +507,7 @@ class ClaudeService:
             board_id = tool_input.get("board_id", "")
 
             # Get board name from board_id
-            board_name = "Unknown Board"
-            for req_type, board_config in get_all_boards().items():
-                if board_config["board_id"] == board_id:
-                    board_name = board_config["board_name"]
-                    break
+            board_name = BOARD_ID_TO_NAME.get(board_id, "Unknown Board")
 
             return {
                 "id": card_data.get("id", ""),
@@ -287,6 +536,10 @@ class ClaudeService:
         if isinstance(result, str):
             return result
         elif isinstance(result, list):
+            # Fast path: MCP results are almost always plain TextContent blocks
+            if result and all(type(item) is TextContent for item in result):
+                return '\n'.join(item.text for item in result)
+
             # Handle list of ContentBlock objects from MCP
             # Each ContentBlock may have a .text attribute (TextContent)
             text_parts = []
@@ -301,17 +554,43 @@ class ClaudeService:
                     text_parts.append(item)
                 elif isinstance(item, dict):
                     # If it's a dict, serialize it
-                    text_parts.append(json.dumps(item, indent=2))
+                    text_parts.append(json_utils.dumps_pretty(item))
                 else:
                     # Fallback to string representation
                     text_parts.append(str(item))
 
             return '\n'.join(text_parts) if text_parts else str(result)
         elif isinstance(result, dict):
-            return json.dumps(result, indent=2)
+            return json_utils.dumps_pretty(result)
         else:
             return str(result)
 
+    async def _ensure_mcp_available(self) -> bool:
+        """
+        Make sure the MCP server is reachable before running a conversation turn.
+
+        Connects if needed; an established connection is pinged at most once
+        every MCP_PING_INTERVAL_SECONDS and reconnected if the ping fails.
+
+        Returns:
+            True if the MCP server is available, False otherwise
+        """
+        now = time.monotonic()
+        if await mcp_client.health_check():
+            if now - self._last_mcp_ping_ts < MCP_PING_INTERVAL_SECONDS:
+                return True
+            if await mcp_client.ping():
+                self._last_mcp_ping_ts = now
+                return True
+
+        try:
+            await mcp_client.connect()
+        except Exception:
+            return False
+
+        self._last_mcp_ping_ts = now
+        return True
+
     async def health_check(self) -> bool:
         """
         Check if Claude API is accessible.
@@ -1,6 +1,7 @@
 """
 Configuration management for the FastAPI backend.
 """
+from functools import cached_property
 from pydantic_settings import BaseSettings
 from typing import List
 
@@ -12,11 +13,26 @@ class Settings(BaseSettings):
     anthropic_api_key: str
     claude_model: str = "claude-sonnet-4-20250514"
     claude_max_tokens: int = 4096
+    claude_programmatic_tool_calling: bool = False
+    claude_programmatic_tool_beta: str = "advanced-tool-use-2025-11-20"
+
+    # Response Cache Configuration
+    response_cache_size: int = 256
+    response_cache_ttl_seconds: int = 300
+    opening_message_cache: bool = True  # Reuse answers to opening messages that differ only in case, punctuation or spacing
 
     # MCP Server Configuration
     mcp_server_command: str = "python"
     mcp_server_args: str = "../mcp-server/server.py"
     mcp_server_url: str = ""  # HTTP URL for production (e.g., https://trello-ai-mcp.onrender.com)
+    mcp_pool_size: int = 100  # Keep-alive connections held open to the MCP server
+    mcp_max_connections: int = 1000
+    mcp_http2: bool = True
+    mcp_tools_cache_dir: str = "~/.cache/trello-agent"
+    mcp_tools_cache_ttl_seconds: int = 600  # 0 disables the tool catalog cache
+
+    # Session Storage Configuration
+    redis_url: str = ""  # Redis URL to share sessions across workers (in-memory when empty)
 
     # API Configuration
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
@@ -27,12 +43,12 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins string into a list."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
-    @property
+    @cached_property
     def mcp_server_args_list(self) -> List[str]:
         """Parse MCP server args into a list."""
         return [arg.strip() for arg in self.mcp_server_args.split(",") if arg.strip()]
@@ -5,7 +5,9 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import weakref
 from datetime import datetime
 
 from config import settings
@@ -20,6 +22,7 @@ from models import (
 from session_manager import session_manager
 from claude_service import claude_service
 from mcp_client import mcp_client
+from request_classifier import classify_request
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +31,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-session locks so concurrent requests on one session take their turns one at a time;
+# a lock disappears once no request holds or waits on it
+_session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _get_session_lock(session_id: str) -> asyncio.Lock:
+    """Get the lock serializing chat turns of a session."""
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _session_locks[session_id] = lock
+    return lock
+
 
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
@@ -52,6 +68,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error disconnecting MCP client: {e}")
 
+    try:
+        await session_manager.close()
+    except Exception as e:
+        logger.error(f"Error closing session manager: {e}")
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -98,21 +119,33 @@ async def chat(request: ChatRequest) -> ChatResponse:
     try:
         logger.info(f"Chat request from session {request.session_id}: {request.message[:50]}...")
 
-        # Get conversation history
-        history = session_manager.get_conversation_history(request.session_id)
-
-        # Process message through Claude
-        result = await claude_service.process_message(
-            user_message=request.message,
-            conversation_history=history,
-            request_type=None  # Could be enhanced to detect request type
-        )
+        # The turn extends the session's history in place, so turns of one session must not interleave
+        async with _get_session_lock(request.session_id):
+            # Get conversation history
+            history = await session_manager.get_conversation_history(request.session_id)
+            base_length = len(history)
+
+            # Detect the request type once per session and reuse it for later turns
+            request_type = await session_manager.get_request_type(request.session_id)
+            if request_type is None:
+                request_type = classify_request(request.message)
+                if request_type:
+                    logger.info(f"Detected request type for session {request.session_id}: {request_type}")
+                    await session_manager.set_request_type(request.session_id, request_type)
+
+            # Process message through Claude
+            result = await claude_service.process_message(
+                user_message=request.message,
+                conversation_history=history,
+                request_type=request_type
+            )
 
-        # Update conversation history
-        session_manager.set_conversation_history(
-            request.session_id,
-            result["updated_history"]
-        )
+            # Update conversation history
+            await session_manager.set_conversation_history(
+                request.session_id,
+                result["updated_history"],
+                base_length=base_length
+            )
 
         # Return response
         return ChatResponse(
@@ -145,7 +178,7 @@ async def reset_session(request: SessionResetRequest) -> SessionResetResponse:
     try:
         logger.info(f"Resetting session: {request.session_id}")
 
-        success = session_manager.clear_session(request.session_id)
+        success = await session_manager.clear_session(request.session_id)
 
         if success:
             return SessionResetResponse(
@@ -187,7 +220,7 @@ async def health_check() -> HealthResponse:
         overall_status = "healthy" if (claude_healthy and mcp_healthy) else "degraded"
 
         # Get session count
-        active_sessions = session_manager.get_active_session_count()
+        active_sessions = await session_manager.get_active_session_count()
 
         return HealthResponse(
             status=overall_status,
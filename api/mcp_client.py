@@ -2,12 +2,20 @@
 MCP client for executing tools via the FastMCP server.
 Supports both STDIO (local) and HTTP (production) modes.
 """
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
 import logging
+import os
+import time
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+import httpx
 from fastmcp import Client as FastMCPClient
+from fastmcp.client.transports import StreamableHttpTransport
 from config import settings
+import json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -18,39 +26,56 @@ class MCPClient:
     def __init__(self):
         """Initialize the MCP client."""
         self.session: Optional[ClientSession] = None
-        self.tools: List[Dict[str, Any]] = []
+        self.tools: Tuple[Dict[str, Any], ...] = ()
         self._connected = False
         self._stdio_context = None
         self._fastmcp_client: Optional[FastMCPClient] = None
         self._fastmcp_context = None
         self._use_http = bool(settings.mcp_server_url)
+        self._connect_lock = asyncio.Lock()
+
+        # On-disk cache of the tool catalog, keyed by the server it came from
+        self._tools_cache_dir = Path(settings.mcp_tools_cache_dir).expanduser()
+        self._tools_cache_ttl = settings.mcp_tools_cache_ttl_seconds
 
     async def connect(self) -> None:
         """Connect to the MCP server."""
         if self._connected:
             return
 
+        # Serialize connection attempts so concurrent first requests share one connection
+        async with self._connect_lock:
+            if not self._connected:
+                await self._connect()
+
+    async def _connect(self) -> None:
+        """Open the MCP connection and load the tool catalog."""
         try:
             if self._use_http:
                 # Production: Connect via HTTP using FastMCP Client
                 logger.info(f"Connecting to MCP server via HTTP: {settings.mcp_server_url}")
 
-                # Create FastMCP client with the server URL
-                self._fastmcp_client = FastMCPClient(settings.mcp_server_url)
+                # Create FastMCP client with the server URL over a pooled keep-alive HTTP client
+                transport = StreamableHttpTransport(
+                    settings.mcp_server_url,
+                    httpx_client_factory=self._create_http_client
+                )
+                self._fastmcp_client = FastMCPClient(transport)
 
                 # Enter the client context
                 self._fastmcp_context = self._fastmcp_client
                 await self._fastmcp_context.__aenter__()
 
-                # List tools using FastMCP client
-                tools_response = await self._fastmcp_client.list_tools()
+                # Use the cached tool catalog if fresh, otherwise list tools using FastMCP client
+                cached_tools = self._load_cached_tools()
+                if cached_tools is not None:
+                    self.tools = cached_tools
+                else:
+                    tools_response = await self._fastmcp_client.list_tools()
 
-                # Convert tools to Claude format
-                self.tools = [{
-                    "name": tool.name,
-                    "description": tool.description or "",
-                    "input_schema": tool.inputSchema if hasattr(tool, 'inputSchema') else {"type": "object", "properties": {}}
-                } for tool in tools_response]
+                    # Convert tools to Claude format
+                    self.tools = self._convert_tools_to_claude_format(tools_response)
+                    self._store_cached_tools(self.tools)
 
                 self._connected = True
                 logger.info(f"Connected to MCP server via HTTP, loaded {len(self.tools)} tools")
@@ -70,12 +95,17 @@ class MCPClient:
                 self.session = ClientSession(read, write)
                 await self.session.__aenter__()
 
-                # Initialize and list tools
+                # Initialize and list tools (unless the cached tool catalog is fresh)
                 await self.session.initialize()
-                tools_list = await self.session.list_tools()
+                cached_tools = self._load_cached_tools()
+                if cached_tools is not None:
+                    self.tools = cached_tools
+                else:
+                    tools_list = await self.session.list_tools()
 
-                # Convert MCP tools to Claude-compatible format
-                self.tools = self._convert_tools_to_claude_format(tools_list.tools)
+                    # Convert MCP tools to Claude-compatible format
+                    self.tools = self._convert_tools_to_claude_format(tools_list.tools)
+                    self._store_cached_tools(self.tools)
 
                 self._connected = True
                 logger.info(f"Connected to MCP server via STDIO, loaded {len(self.tools)} tools")
@@ -93,20 +123,62 @@ class MCPClient:
                 await self.session.__aexit__(None, None, None)
             if self._stdio_context:
                 await self._stdio_context.__aexit__(None, None, None)
-            self._connected = False
             logger.info("Disconnected from MCP server")
         except Exception as e:
             logger.error(f"Error disconnecting from MCP server: {e}")
+        finally:
+            # Forget the old contexts so a later connect() starts from scratch
+            self._connected = False
+            self._fastmcp_context = None
+            self.session = None
+            self._stdio_context = None
+
+    def _create_http_client(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        auth: Optional[httpx.Auth] = None
+    ) -> httpx.AsyncClient:
+        """
+        Create the HTTP client used by the MCP transport.
+
+        Keeps a large pool of keep-alive connections (optionally over HTTP/2) so
+        tool calls to the MCP server reuse connections instead of repeating the
+        TCP and TLS handshakes.
+
+        Args:
+            headers: Headers requested by the MCP transport
+            timeout: Timeout requested by the MCP transport
+            auth: Authentication requested by the MCP transport
 
-    def _convert_tools_to_claude_format(self, mcp_tools: List[Any]) -> List[Dict[str, Any]]:
+        Returns:
+            Configured async HTTP client
+        """
+        return httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout or httpx.Timeout(30.0, connect=5.0),
+            auth=auth,
+            follow_redirects=True,
+            http2=settings.mcp_http2,
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.mcp_pool_size,
+                max_connections=settings.mcp_max_connections,
+                keepalive_expiry=60.0
+            )
+        )
+
+    def _convert_tools_to_claude_format(self, mcp_tools: List[Any]) -> Tuple[Dict[str, Any], ...]:
         """
         Convert MCP tool definitions to Claude API format.
 
+        The last tool carries a cache_control marker so Claude's prompt cache
+        covers the whole tool block. The result is built once per connection.
+
         Args:
             mcp_tools: List of tools from MCP server
 
         Returns:
-            List of tools in Claude API format
+            Tuple of tools in Claude API format
         """
         claude_tools = []
         for tool in mcp_tools:
@@ -117,7 +189,78 @@ class MCPClient:
             }
             claude_tools.append(claude_tool)
 
-        return claude_tools
+        if claude_tools:
+            claude_tools[-1]["cache_control"] = {"type": "ephemeral"}
+
+        return tuple(claude_tools)
+
+    @property
+    def _tools_cache_path(self) -> Path:
+        """
+        Path of the tool catalog cache for the configured server.
+
+        In STDIO mode the key includes the resolved path and modification time of
+        every server argument that is a file, so editing server.py invalidates it.
+
+        Returns:
+            Cache file path
+        """
+        if self._use_http:
+            server_id = settings.mcp_server_url
+        else:
+            parts = [settings.mcp_server_command]
+            for arg in settings.mcp_server_args_list:
+                path = Path(arg).expanduser()
+                if path.is_file():
+                    resolved = path.resolve()
+                    parts.append(f"{resolved}@{resolved.stat().st_mtime_ns}")
+                else:
+                    parts.append(arg)
+            server_id = " ".join(parts)
+
+        cache_key = hashlib.sha256(server_id.encode("utf-8")).hexdigest()
+        return self._tools_cache_dir / f"tools-{cache_key}.json"
+
+    def _load_cached_tools(self) -> Optional[Tuple[Dict[str, Any], ...]]:
+        """
+        Load the tool catalog from the on-disk cache.
+
+        Returns:
+            Cached tools in Claude format, or None if caching is disabled, missing or stale
+        """
+        if self._tools_cache_ttl <= 0:
+            return None
+
+        try:
+            cache_path = self._tools_cache_path
+            if time.time() - os.path.getmtime(cache_path) > self._tools_cache_ttl:
+                return None
+            tools = tuple(json_utils.loads(cache_path.read_bytes()))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Tool cache miss: {e}")
+            return None
+
+        logger.info(f"Loaded {len(tools)} tools from cache: {cache_path}")
+        return tools
+
+    def _store_cached_tools(self, tools: Tuple[Dict[str, Any], ...]) -> None:
+        """
+        Atomically write the tool catalog to the on-disk cache.
+
+        Args:
+            tools: Tools in Claude format
+        """
+        if self._tools_cache_ttl <= 0:
+            return
+
+        try:
+            cache_path = self._tools_cache_path
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(json_utils.dumps(list(tools)))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write tool cache: {e}")
 
     async def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
         """
@@ -143,7 +286,8 @@ class MCPClient:
                 # Execute via HTTP using FastMCP Client
                 result = await self._fastmcp_client.call_tool(tool_name, tool_input)
                 logger.debug(f"Tool {tool_name} result: {result}")
-                return result
+                # Return the content blocks like the STDIO path, so every block gets formatted
+                return result.content
             else:
                 # Execute via STDIO
                 result = await self.session.call_tool(tool_name, tool_input)
@@ -154,27 +298,48 @@ class MCPClient:
             logger.error(f"Error executing tool {tool_name}: {e}")
             raise
 
-    def get_tools(self) -> List[Dict[str, Any]]:
+    def get_tools(self) -> Tuple[Dict[str, Any], ...]:
         """
-        Get the list of available tools in Claude format.
+        Get the available tools in Claude format.
 
         Returns:
-            List of tool definitions
+            Tuple of tool definitions, ready to pass to the Claude API
         """
         return self.tools
 
     async def health_check(self) -> bool:
         """
-        Check if the MCP server is healthy.
+        Check if the MCP client is connected.
+
+        Only reads the connection flag, so frequent health polls never trigger a
+        reconnect; the next tool call reconnects if needed.
+
+        Returns:
+            True if connected, False otherwise
+        """
+        return self._connected
+
+    async def ping(self) -> bool:
+        """
+        Ping the MCP server to check that the connection is alive.
+
+        A failed ping drops the connection so the next connect() starts fresh.
 
         Returns:
-            True if connected and healthy, False otherwise
+            True if the server answered, False otherwise
         """
+        if not self._connected:
+            return False
+
         try:
-            if not self._connected:
-                await self.connect()
-            return self._connected
-        except Exception:
+            if self._use_http:
+                await self._fastmcp_client.ping()
+            else:
+                await self.session.send_ping()
+            return True
+        except Exception as e:
+            logger.warning(f"MCP server ping failed: {e}")
+            await self.disconnect()
             return False
 
 
@@ -1,12 +1,16 @@
 """
 Prompt management system for handling base and request-type specific prompts.
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Marker in the base prompt where request-type specific instructions are inserted
+PLACEHOLDER = "[PLACEHOLDER: Request-type specific instructions will be inserted here based on classification]"
+
 
 class PromptManager:
     """Manages system prompts with support for base and request-type specific prompts."""
@@ -21,6 +25,9 @@ class PromptManager:
         self.prompts_dir = Path(__file__).parent / prompts_dir
         self.base_prompt: Optional[str] = None
         self.request_type_prompts: Dict[str, str] = {}
+        self._prompt_prefix: str = ""
+        self._prompt_suffix: str = ""
+        self._base_prompt_no_placeholder: str = ""
         self._load_prompts()
 
     def _load_prompts(self) -> None:
@@ -49,6 +56,18 @@ class PromptManager:
             logger.error(f"Error loading prompts: {e}")
             self.base_prompt = self._get_fallback_base_prompt()
 
+        # Split the base prompt around the placeholder once, so composing a prompt
+        # is a join instead of a search and replace over the whole base prompt
+        prefix, found, suffix = self.base_prompt.partition(PLACEHOLDER)
+        if found:
+            self._prompt_prefix, self._prompt_suffix = prefix, suffix
+        else:
+            # If no placeholder, instructions are appended to the end
+            self._prompt_prefix, self._prompt_suffix = self.base_prompt + "\n\n", ""
+
+        # Precompute the prompt used when no request type is known
+        self._base_prompt_no_placeholder = self.base_prompt.replace(PLACEHOLDER, "").strip()
+
     def _get_fallback_base_prompt(self) -> str:
         """Return a basic fallback prompt if file loading fails."""
         return """You are a helpful Trello ticket management assistant.
@@ -68,31 +87,34 @@ Be conversational, ask clarifying questions, and confirm details before taking a
         if not self.base_prompt:
             return self._get_fallback_base_prompt()
 
-        # Start with base prompt
-        prompt = self.base_prompt
-
         # Add request-type specific instructions if available
         if request_type and request_type in self.request_type_prompts:
-            # Replace placeholder with actual instructions
-            placeholder = "[PLACEHOLDER: Request-type specific instructions will be inserted here based on classification]"
-            if placeholder in prompt:
-                prompt = prompt.replace(placeholder, self.request_type_prompts[request_type])
-            else:
-                # If no placeholder, append to end
-                prompt += "\n\n" + self.request_type_prompts[request_type]
-
             logger.debug(f"Using system prompt with {request_type} instructions")
-        else:
-            # Remove placeholder if no specific type
-            placeholder = "[PLACEHOLDER: Request-type specific instructions will be inserted here based on classification]"
-            prompt = prompt.replace(placeholder, "")
-            logger.debug("Using base system prompt only")
+            return self._compose(self._prompt_prefix, self.request_type_prompts[request_type], self._prompt_suffix)
 
-        return prompt.strip()
+        logger.debug("Using base system prompt only")
+        return self._base_prompt_no_placeholder
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _compose(prefix: str, instructions: str, suffix: str) -> str:
+        """
+        Combine the split base prompt with request-type specific instructions.
+
+        Args:
+            prefix: Base prompt text before the placeholder
+            instructions: Request-type specific instructions
+            suffix: Base prompt text after the placeholder
+
+        Returns:
+            Complete system prompt
+        """
+        return "".join((prefix, instructions, suffix)).strip()
 
     def reload_prompts(self) -> None:
         """Reload all prompts from disk (useful for development)."""
         logger.info("Reloading prompts...")
+        self._compose.cache_clear()
         self._load_prompts()
 
     def get_available_request_types(self) -> list:
@@ -0,0 +1,76 @@
+"""
+Keyword-based request type classifier for routing conversations without a Claude round-trip.
+"""
+from typing import Dict, Optional, Pattern
+import re
+
+# Keyword patterns per request type, mirroring the classification guide in the base prompt
+REQUEST_TYPE_PATTERNS: Dict[str, Pattern[str]] = {
+    "desktop_support": re.compile(
+        r"\b(passwords?|vpn|log ?in|login|sign ?in|locked out|account access|e-?mail|outlook|"
+        r"software|install(ation)?|licen[cs]e|network|internet|wi-?fi|laptop|computer|crash(es|ed|ing)?|"
+        r"windows (updates?|1[01])|(keeps|kept) freezing|frozen|blue screen)\b"
+    ),
+    # Windows, locks and heat only count in a physical context, "Windows update" or "screen lock" is IT
+    "facilities_support": re.compile(
+        r"\b(monitors?|keyboards?|mice|mouse|printers?|furniture|chairs?|desks?|temperature|hvac|"
+        r"heaters?|no heat|heating (is |isn'?t |not )?(on|off|broken|working)|air ?con(ditioning)?|"
+        r"too (hot|cold)|lights?|lighting|plumbing|leak(ing|s)?|toilets?|doors?|door locks?|"
+        r"windows? (won'?t|will not|doesn'?t|does not|can'?t) (open|close|shut|lock)|"
+        r"windows? (is |are )?(broken|stuck|cracked|jammed)|broken windows?|"
+        r"locks? (is |are )?(broken|stuck|jammed))\b"
+    ),
+    "missing_report": re.compile(
+        r"\b(missing|never (got|received|arrived)|not received|didn'?t (get|receive|arrive|come))\b.*\breports?\b|"
+        r"\breports?\b.*\b(missing|never (got|arrived|came)|not received|didn'?t (arrive|come)|hasn'?t (arrived|come))\b"
+    ),
+    "new_report": re.compile(
+        r"\bnew reports?\b|\b(create|build|need|want|request) (a |an )?(new )?reports?\b"
+    ),
+    "enhancement_request": re.compile(
+        r"\b(enhancements?|feature requests?|new feature|improvements?|improve)\b"
+    ),
+}
+
+
+def classify_request(message: str) -> Optional[str]:
+    """
+    Classify a user message into a request type using keyword patterns.
+
+    Args:
+        message: The user's message
+
+    Returns:
+        Request type if exactly one type matches, None if the message is ambiguous or unmatched
+    """
+    text = message.lower()
+    matches = [
+        request_type
+        for request_type, pattern in REQUEST_TYPE_PATTERNS.items()
+        if pattern.search(text)
+    ]
+
+    if len(matches) == 1:
+        return matches[0]
+
+    return None
+
+
+# Sample messages and the type they must classify as, run this module to check them
+REGRESSION_CASES = (
+    ("Windows update keeps failing", "desktop_support"),
+    ("Windows keeps freezing", "desktop_support"),
+    ("my screen is frozen on windows 11", "desktop_support"),
+    ("The window won't open in room 204", "facilities_support"),
+    ("The window is stuck and it's too cold", "facilities_support"),
+    ("The heating is off on the third floor", "facilities_support"),
+    ("The lock is broken on the supply room", "facilities_support"),
+    ("My account locks after one wrong password", "desktop_support"),
+)
+
+
+if __name__ == "__main__":
+    for sample, expected in REGRESSION_CASES:
+        actual = classify_request(sample)
+        assert actual == expected, f"{sample!r}: expected {expected}, got {actual}"
+    print(f"All {len(REGRESSION_CASES)} classifier cases passed")
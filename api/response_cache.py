@@ -0,0 +1,113 @@
+"""
+In-memory response cache for replaying Claude responses to repeated conversations.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import re
+import time
+import json_utils
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class ResponseCache:
+    """Bounded LRU cache of chat responses with a time-to-live."""
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 300.0):
+        """
+        Initialize the response cache.
+
+        Args:
+            max_size: Maximum number of responses to keep
+            ttl_seconds: Seconds before a cached response expires
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        system_prompt: str,
+        conversation_history: List[Dict[str, Any]],
+        user_message: str
+    ) -> str:
+        """
+        Build a deterministic cache key for a chat request.
+
+        Args:
+            system_prompt: Complete system prompt sent to Claude
+            conversation_history: Previous conversation messages
+            user_message: The user's message
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json_utils.dumps(
+            {"sys": system_prompt, "hist": conversation_history, "msg": user_message},
+            default=str,
+            sort_keys=True
+        )
+        return hashlib.blake2b(payload).hexdigest()
+
+    @staticmethod
+    def make_message_key(request_type: Optional[str], user_message: str) -> Optional[str]:
+        """
+        Build a cache key for an opening message, ignoring case, punctuation and spacing.
+
+        Args:
+            request_type: Request type the message was classified as, keeps boards apart
+            user_message: The user's message
+
+        Returns:
+            Hex digest identifying the normalized message, or None if it has no words
+        """
+        tokens = _TOKEN_PATTERN.findall(user_message.lower())
+        if not tokens:
+            return None
+        payload = f"{request_type or ''}\n{' '.join(tokens)}".encode()
+        return hashlib.blake2b(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Store a response, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key from make_key
+            response: Response dictionary to store
+        """
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
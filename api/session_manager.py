@@ -1,9 +1,14 @@
 """
-In-memory session manager for storing conversation history.
+Session managers for storing conversation history, in memory or in Redis.
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import heapq
 import logging
+import time
+from redis.asyncio import Redis
+from config import settings
+import json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +25,14 @@ class SessionManager:
         """
         self.sessions: Dict[str, Dict[str, Any]] = {}
         self.session_timeout = timedelta(minutes=session_timeout_minutes)
-
-    def get_conversation_history(self, session_id: str) -> List[Dict[str, Any]]:
+        self._timeout_seconds = session_timeout_minutes * 60
+        # Min-heap of (expiry time, session_id); entries go stale when a session is touched again
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Expiry sweeps run at most once per interval unless forced
+        self._cleanup_interval = 30.0
+        self._last_cleanup = 0.0
+
+    async def get_conversation_history(self, session_id: str) -> List[Dict[str, Any]]:
         """
         Get conversation history for a session.
 
@@ -38,15 +49,15 @@ class SessionManager:
             self.sessions[session_id] = {
                 "messages": [],
                 "created_at": datetime.now(),
-                "last_activity": datetime.now()
+                "last_activity": time.monotonic()
             }
 
         # Update last activity
-        self.sessions[session_id]["last_activity"] = datetime.now()
+        self._touch(session_id)
 
         return self.sessions[session_id]["messages"]
 
-    def add_message(self, session_id: str, message: Dict[str, Any]) -> None:
+    async def add_message(self, session_id: str, message: Dict[str, Any]) -> None:
         """
         Add a message to the conversation history.
 
@@ -55,34 +66,71 @@ class SessionManager:
             message: Message to add (dict with 'role' and 'content')
         """
         if session_id not in self.sessions:
-            self.get_conversation_history(session_id)  # Initialize if needed
+            await self.get_conversation_history(session_id)  # Initialize if needed
 
         self.sessions[session_id]["messages"].append(message)
-        self.sessions[session_id]["last_activity"] = datetime.now()
+        self._touch(session_id)
 
         logger.debug(f"Added message to session {session_id}: {message.get('role')}")
 
-    def set_conversation_history(self, session_id: str, messages: List[Dict[str, Any]]) -> None:
+    async def set_conversation_history(
+        self,
+        session_id: str,
+        messages: List[Dict[str, Any]],
+        base_length: Optional[int] = None
+    ) -> None:
         """
         Replace the entire conversation history for a session.
 
         Args:
             session_id: Session identifier
             messages: Complete list of messages
+            base_length: Length of the history the messages were built on (unused in
+                memory, where turns of a session are serialized by the caller)
         """
         if session_id not in self.sessions:
             self.sessions[session_id] = {
                 "messages": [],
                 "created_at": datetime.now(),
-                "last_activity": datetime.now()
+                "last_activity": time.monotonic()
             }
 
         self.sessions[session_id]["messages"] = messages
-        self.sessions[session_id]["last_activity"] = datetime.now()
+        self._touch(session_id)
 
         logger.debug(f"Set conversation history for session {session_id}: {len(messages)} messages")
 
-    def clear_session(self, session_id: str) -> bool:
+    async def get_request_type(self, session_id: str) -> Optional[str]:
+        """
+        Get the request type detected for a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Request type if one has been detected, None otherwise
+        """
+        if session_id not in self.sessions:
+            return None
+
+        return self.sessions[session_id].get("request_type")
+
+    async def set_request_type(self, session_id: str, request_type: str) -> None:
+        """
+        Store the request type detected for a session.
+
+        Args:
+            session_id: Session identifier
+            request_type: Detected request type
+        """
+        if session_id not in self.sessions:
+            await self.get_conversation_history(session_id)  # Initialize if needed
+
+        self.sessions[session_id]["request_type"] = request_type
+
+        logger.debug(f"Set request type for session {session_id}: {request_type}")
+
+    async def clear_session(self, session_id: str) -> bool:
         """
         Clear a specific session.
 
@@ -98,30 +146,50 @@ class SessionManager:
             return True
         return False
 
-    def get_active_session_count(self) -> int:
+    async def get_active_session_count(self) -> int:
         """
         Get the number of active sessions.
 
         Returns:
             Number of sessions
         """
-        self._cleanup_expired_sessions()
+        self._cleanup_expired_sessions(force=True)
         return len(self.sessions)
 
-    def _cleanup_expired_sessions(self) -> None:
-        """Remove sessions that have been inactive for too long."""
-        now = datetime.now()
-        expired_sessions = [
-            session_id
-            for session_id, data in self.sessions.items()
-            if now - data["last_activity"] > self.session_timeout
-        ]
+    def _touch(self, session_id: str) -> None:
+        """
+        Record activity on a session and schedule its expiry.
 
-        for session_id in expired_sessions:
-            del self.sessions[session_id]
-            logger.info(f"Expired session removed: {session_id}")
+        Args:
+            session_id: Session identifier
+        """
+        now = time.monotonic()
+        self.sessions[session_id]["last_activity"] = now
+        heapq.heappush(self._expiry_heap, (now + self._timeout_seconds, session_id))
+
+    def _cleanup_expired_sessions(self, force: bool = False) -> None:
+        """
+        Remove sessions that have been inactive for too long.
 
-    def get_session_info(self, session_id: str) -> Dict[str, Any]:
+        Args:
+            force: Sweep even if the last sweep was less than the cleanup interval ago
+        """
+        now = time.monotonic()
+        if not force and now - self._last_cleanup < self._cleanup_interval:
+            return
+        self._last_cleanup = now
+
+        heap = self._expiry_heap
+
+        # Only entries past their expiry are visited; stale ones are simply dropped
+        while heap and heap[0][0] < now:
+            _, session_id = heapq.heappop(heap)
+            data = self.sessions.get(session_id)
+            if data is not None and data["last_activity"] + self._timeout_seconds < now:
+                del self.sessions[session_id]
+                logger.info(f"Expired session removed: {session_id}")
+
+    async def get_session_info(self, session_id: str) -> Dict[str, Any]:
         """
         Get information about a session.
 
@@ -137,14 +205,260 @@ class SessionManager:
             }
 
         data = self.sessions[session_id]
+        idle_seconds = time.monotonic() - data["last_activity"]
         return {
             "exists": True,
             "message_count": len(data["messages"]),
             "created_at": data["created_at"],
-            "last_activity": data["last_activity"],
+            "last_activity": datetime.now() - timedelta(seconds=idle_seconds),
             "age_minutes": (datetime.now() - data["created_at"]).total_seconds() / 60
         }
 
+    async def close(self) -> None:
+        """Release resources held by the session manager (nothing to release in memory)."""
+
+
+class RedisSessionManager:
+    """
+    Manages conversation sessions in Redis.
+
+    Sessions are shared by every worker process and survive restarts. Each session
+    is a list of JSON-encoded messages plus a metadata hash, and Redis key expiry
+    replaces the in-memory cleanup sweep. A sorted set of session IDs scored by
+    expiry time keeps the active session count cheap.
+    """
+
+    # Sorted set of session IDs scored by the Unix time they expire at
+    SESSIONS_KEY = "sessions:expiry"
+
+    # Push ARGV[2..] onto the list only if it still holds ARGV[1] items; returns -1 otherwise
+    APPEND_IF_LENGTH_SCRIPT = """
+    if redis.call('LLEN', KEYS[1]) ~= tonumber(ARGV[1]) then
+        return -1
+    end
+    if #ARGV > 1 then
+        redis.call('RPUSH', KEYS[1], unpack(ARGV, 2))
+    end
+    return #ARGV - 1
+    """
+
+    def __init__(self, redis_url: str, session_timeout_minutes: int = 60):
+        """
+        Initialize the session manager.
+
+        Args:
+            redis_url: Redis connection URL (e.g., redis://localhost:6379/0)
+            session_timeout_minutes: Minutes of inactivity before session expires
+        """
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self._append_if_length = self.redis.register_script(self.APPEND_IF_LENGTH_SCRIPT)
+        self._timeout_seconds = session_timeout_minutes * 60
+
+    @staticmethod
+    def _messages_key(session_id: str) -> str:
+        """Redis key holding the session's message list."""
+        return f"session:{session_id}:messages"
+
+    @staticmethod
+    def _meta_key(session_id: str) -> str:
+        """Redis key holding the session's metadata hash."""
+        return f"session:{session_id}:meta"
+
+    @staticmethod
+    def _to_json(value: Any) -> Any:
+        """Convert Anthropic SDK content blocks the way the SDK does when sending them."""
+        if hasattr(value, "model_dump"):
+            return value.model_dump(mode="json", exclude_unset=True)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def _serialize(self, message: Dict[str, Any]) -> str:
+        """Encode a message for storage in Redis."""
+        return json_utils.dumps(message, default=self._to_json).decode("utf-8")
+
+    def _touch(self, pipe: Any, session_id: str) -> None:
+        """Queue session creation and expiry refresh on a pipeline."""
+        pipe.hsetnx(self._meta_key(session_id), "created_at", datetime.now().isoformat())
+        pipe.expire(self._meta_key(session_id), self._timeout_seconds)
+        pipe.expire(self._messages_key(session_id), self._timeout_seconds)
+        pipe.zadd(self.SESSIONS_KEY, {session_id: time.time() + self._timeout_seconds})
+
+    async def get_conversation_history(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Get conversation history for a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            List of messages in the conversation
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.lrange(self._messages_key(session_id), 0, -1)
+            self._touch(pipe, session_id)
+            raw_messages, created, *_ = await pipe.execute()
+
+        if created:
+            logger.info(f"Creating new session: {session_id}")
+
+        return [json_utils.loads(raw) for raw in raw_messages]
+
+    async def add_message(self, session_id: str, message: Dict[str, Any]) -> None:
+        """
+        Add a message to the conversation history.
+
+        Args:
+            session_id: Session identifier
+            message: Message to add (dict with 'role' and 'content')
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(self._messages_key(session_id), self._serialize(message))
+            self._touch(pipe, session_id)
+            await pipe.execute()
+
+        logger.debug(f"Added message to session {session_id}: {message.get('role')}")
+
+    async def set_conversation_history(
+        self,
+        session_id: str,
+        messages: List[Dict[str, Any]],
+        base_length: Optional[int] = None
+    ) -> None:
+        """
+        Replace the entire conversation history for a session.
+
+        Histories are append-only during a conversation, so when the messages extend
+        the history they were built on, only the new messages are serialized and
+        pushed - atomically, and only if the stored list still has base_length
+        messages. If another worker changed the session in the meantime, the history
+        is rewritten in full so the stored list always matches a consistent turn.
+
+        Args:
+            session_id: Session identifier
+            messages: Complete list of messages
+            base_length: Length of the history loaded before the messages were built
+        """
+        messages_key = self._messages_key(session_id)
+
+        if base_length is not None and len(messages) >= base_length:
+            new_messages = [self._serialize(m) for m in messages[base_length:]]
+            appended = await self._append_if_length(keys=[messages_key], args=[base_length, *new_messages])
+            if appended >= 0:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    self._touch(pipe, session_id)
+                    await pipe.execute()
+                logger.debug(f"Appended {len(new_messages)} messages to session {session_id}")
+                return
+
+            logger.warning(f"Session {session_id} changed concurrently, rewriting its history")
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(messages_key)
+            if messages:
+                pipe.rpush(messages_key, *[self._serialize(m) for m in messages])
+            self._touch(pipe, session_id)
+            await pipe.execute()
+
+        logger.debug(f"Set conversation history for session {session_id}: {len(messages)} messages")
+
+    async def get_request_type(self, session_id: str) -> Optional[str]:
+        """
+        Get the request type detected for a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Request type if one has been detected, None otherwise
+        """
+        return await self.redis.hget(self._meta_key(session_id), "request_type")
+
+    async def set_request_type(self, session_id: str, request_type: str) -> None:
+        """
+        Store the request type detected for a session.
+
+        Args:
+            session_id: Session identifier
+            request_type: Detected request type
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._meta_key(session_id), "request_type", request_type)
+            self._touch(pipe, session_id)
+            await pipe.execute()
+
+        logger.debug(f"Set request type for session {session_id}: {request_type}")
+
+    async def clear_session(self, session_id: str) -> bool:
+        """
+        Clear a specific session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if session existed and was cleared, False otherwise
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._messages_key(session_id), self._meta_key(session_id))
+            pipe.zrem(self.SESSIONS_KEY, session_id)
+            deleted, _ = await pipe.execute()
+
+        if deleted:
+            logger.info(f"Cleared session: {session_id}")
+            return True
+        return False
+
+    async def get_active_session_count(self) -> int:
+        """
+        Get the number of active sessions.
+
+        Returns:
+            Number of sessions
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            # Drop expired sessions from the index, then count what is left
+            pipe.zremrangebyscore(self.SESSIONS_KEY, "-inf", time.time())
+            pipe.zcard(self.SESSIONS_KEY)
+            _, count = await pipe.execute()
+        return count
+
+    async def get_session_info(self, session_id: str) -> Dict[str, Any]:
+        """
+        Get information about a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Dictionary with session metadata
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hget(self._meta_key(session_id), "created_at")
+            pipe.llen(self._messages_key(session_id))
+            pipe.ttl(self._meta_key(session_id))
+            created_at, message_count, ttl = await pipe.execute()
+
+        if created_at is None:
+            return {
+                "exists": False
+            }
+
+        created_at = datetime.fromisoformat(created_at)
+        idle_seconds = max(self._timeout_seconds - ttl, 0)
+        return {
+            "exists": True,
+            "message_count": message_count,
+            "created_at": created_at,
+            "last_activity": datetime.now() - timedelta(seconds=idle_seconds),
+            "age_minutes": (datetime.now() - created_at).total_seconds() / 60
+        }
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.redis.aclose()
+
 
-# Global session manager instance
-session_manager = SessionManager(session_timeout_minutes=60)
+# Global session manager instance (Redis-backed when REDIS_URL is configured)
+if settings.redis_url:
+    session_manager = RedisSessionManager(settings.redis_url, session_timeout_minutes=60)
+else:
+    session_manager = SessionManager(session_timeout_minutes=60)
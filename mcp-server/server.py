@@ -2,19 +2,83 @@
 FastMCP server for Trello integration.
 Provides tools for searching, viewing, and creating Trello cards.
 """
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import wraps
+import time
 from fastmcp import FastMCP
-from trello_client import TrelloClient
-from typing import Optional, List
+from trello_client import AsyncTrelloClient, close_async_client
+from typing import Any, Callable, Dict, Optional, List
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Close the shared Trello HTTP client when the server shuts down."""
+    try:
+        yield
+    finally:
+        await close_async_client()
+
 
 # Initialize FastMCP server
-mcp = FastMCP("Trello MCP Server")
+mcp = FastMCP("Trello MCP Server", lifespan=lifespan)
 
 # Initialize Trello client
-trello_client = TrelloClient()
+trello_client = AsyncTrelloClient()
+
+# Result caches of the read-only tools, by tool name
+_tool_caches: Dict[str, OrderedDict] = {}
+
+
+def ttl_cache(ttl_seconds: float = 60, maxsize: int = 512) -> Callable:
+    """
+    Cache successful results of an async read-only tool, keyed by its arguments.
+
+    Args:
+        ttl_seconds: Seconds a cached result stays valid
+        maxsize: Maximum number of cached results, least recently used are evicted first
+    """
+    def decorator(fn: Callable) -> Callable:
+        cache: OrderedDict = OrderedDict()
+        _tool_caches[fn.__name__] = cache
+
+        @wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> dict:
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            hit = cache.get(key)
+            if hit is not None and now - hit[0] < ttl_seconds:
+                cache.move_to_end(key)
+                return hit[1]
+
+            result = await fn(*args, **kwargs)
+
+            # Don't cache failures, the next call should retry
+            if "error" not in result:
+                cache[key] = (now, result)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def clear_tool_cache(*tool_names: str) -> None:
+    """Drop cached results of the given tools."""
+    for tool_name in tool_names:
+        cache = _tool_caches.get(tool_name)
+        if cache is not None:
+            cache.clear()
 
 
 @mcp.tool()
-def search_trello_cards(
+@ttl_cache(ttl_seconds=30)
+async def search_trello_cards(
     query: Optional[str] = None,
     list_name: Optional[str] = None,
     label: Optional[str] = None,
@@ -33,7 +97,7 @@ def search_trello_cards(
         Dictionary containing matching cards and total count
     """
     try:
-        result = trello_client.search_cards(
+        result = await trello_client.search_cards(
             query=query,
             list_name=list_name,
             label=label,
@@ -49,7 +113,8 @@ def search_trello_cards(
 
 
 @mcp.tool()
-def get_trello_card_details(card_id: str) -> dict:
+@ttl_cache(ttl_seconds=15)
+async def get_trello_card_details(card_id: str) -> dict:
     """
     Get full details of a specific Trello card.
 
@@ -60,7 +125,7 @@ def get_trello_card_details(card_id: str) -> dict:
         Dictionary containing card details including comments, members, and attachments
     """
     try:
-        result = trello_client.get_card_details(card_id)
+        result = await trello_client.get_card_details(card_id)
         return result
     except Exception as e:
         return {
@@ -69,7 +134,8 @@ def get_trello_card_details(card_id: str) -> dict:
 
 
 @mcp.tool()
-def list_trello_boards() -> dict:
+@ttl_cache(ttl_seconds=300)
+async def list_trello_boards() -> dict:
     """
     List all available Trello boards for the authenticated user.
 
@@ -77,7 +143,7 @@ def list_trello_boards() -> dict:
         Dictionary containing list of boards with their IDs, names, and URLs
     """
     try:
-        boards = trello_client.get_boards()
+        boards = await trello_client.get_boards()
         return {
             "boards": boards
         }
@@ -89,7 +155,8 @@ def list_trello_boards() -> dict:
 
 
 @mcp.tool()
-def list_trello_lists(board_id: str) -> dict:
+@ttl_cache(ttl_seconds=120)
+async def list_trello_lists(board_id: str) -> dict:
     """
     List all lists in a specific Trello board.
 
@@ -100,7 +167,7 @@ def list_trello_lists(board_id: str) -> dict:
         Dictionary containing lists with their IDs, names, and card counts
     """
     try:
-        lists = trello_client.get_lists(board_id)
+        lists = await trello_client.get_lists(board_id)
         return {
             "lists": lists
         }
@@ -112,7 +179,7 @@ def list_trello_lists(board_id: str) -> dict:
 
 
 @mcp.tool()
-def create_trello_card(
+async def create_trello_card(
     list_id: str,
     name: str,
     desc: str = "",
@@ -135,7 +202,7 @@ def create_trello_card(
         Dictionary containing success status and created card details
     """
     try:
-        result = trello_client.create_card(
+        result = await trello_client.create_card(
             board_id=board_id,
             list_id=list_id,
             name=name,
@@ -143,6 +210,9 @@ def create_trello_card(
             labels=labels,
             due=due
         )
+        if result.get("success"):
+            # New card changes search results and list card counts
+            clear_tool_cache("search_trello_cards", "list_trello_lists")
         return result
     except Exception as e:
         return {
@@ -2,19 +2,27 @@
 Quick setup check script - verifies your environment is ready for testing.
 Run this first before running any other tests.
 """
+import importlib.util
 import os
 import sys
-from pathlib import Path
+
+from win_console import fix_console_encoding
 
 # Fix Windows console encoding for Unicode characters
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+fix_console_encoding()
+
+# Files, environment variables and packages checked by main()
+REQUIRED_FILES = ("server.py", "trello_client.py", "requirements.txt")
+REQUIRED_ENV_VARS = ("TRELLO_API_KEY", "TRELLO_API_TOKEN")
+OPTIONAL_ENV_VARS = ("TRELLO_DEFAULT_BOARD_ID",)
+REQUIRED_PACKAGES = ("dotenv", "httpx", "h2", "orjson", "fastmcp", "pydantic")
+# Only the sync client in test_trello_client.py uses requests, the server runs on httpx
+TEST_PACKAGES = ("requests",)
 
 
 def check_file_exists(filepath, description):
     """Check if a file exists."""
-    if Path(filepath).exists():
+    if os.path.exists(filepath):
         print(f"✓ {description}")
         return True
     else:
@@ -48,12 +56,11 @@ def check_python_version():
 
 
 def check_package_installed(package_name):
-    """Check if a Python package is installed."""
-    try:
-        __import__(package_name)
+    """Check if a Python package is installed (without importing it)."""
+    if importlib.util.find_spec(package_name) is not None:
         print(f"✓ {package_name} is installed")
         return True
-    except ImportError:
+    else:
         print(f"✗ {package_name} is not installed")
         return False
 
@@ -71,9 +78,8 @@ def main():
 
     # Check 2: Required files
     print("\n2. Checking required files...")
-    all_checks_passed &= check_file_exists("server.py", "server.py exists")
-    all_checks_passed &= check_file_exists("trello_client.py", "trello_client.py exists")
-    all_checks_passed &= check_file_exists("requirements.txt", "requirements.txt exists")
+    for filename in REQUIRED_FILES:
+        all_checks_passed &= check_file_exists(filename, f"{filename} exists")
 
     env_exists = check_file_exists(".env", ".env file exists")
     if not env_exists:
@@ -87,19 +93,18 @@ def main():
         from dotenv import load_dotenv
         load_dotenv()
 
-        all_checks_passed &= check_env_var("TRELLO_API_KEY", required=True)
-        all_checks_passed &= check_env_var("TRELLO_API_TOKEN", required=True)
-        check_env_var("TRELLO_DEFAULT_BOARD_ID", required=False)
+        for var_name in REQUIRED_ENV_VARS:
+            all_checks_passed &= check_env_var(var_name, required=True)
+        for var_name in OPTIONAL_ENV_VARS:
+            check_env_var(var_name, required=False)
     else:
         print("\n3. Skipping environment variable check (.env not found)")
 
     # Check 4: Python packages
     print("\n4. Checking Python packages...")
     packages_ok = True
-    packages_ok &= check_package_installed("dotenv")
-    packages_ok &= check_package_installed("requests")
-    packages_ok &= check_package_installed("fastmcp")
-    packages_ok &= check_package_installed("pydantic")
+    for package_name in REQUIRED_PACKAGES + TEST_PACKAGES:
+        packages_ok &= check_package_installed(package_name)
 
     if not packages_ok:
         print("  → Run: pip install -r requirements.txt")
@@ -2,20 +2,18 @@
 Test script for MCP tools - tests the Trello client functions directly.
 This simulates the functionality that the MCP tools will use.
 """
-import sys
+from win_console import fix_console_encoding
 
 # Fix Windows console encoding for Unicode characters
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+fix_console_encoding()
 
-import json
+import json_utils
 from trello_client import TrelloClient
 
 
 def print_json(data):
     """Pretty print JSON data."""
-    print(json.dumps(data, indent=2))
+    print(json_utils.dumps_pretty(data))
 
 
 def main():
@@ -2,20 +2,18 @@
 Simple test script for Trello client - tests without MCP layer.
 Run this to verify your Trello API credentials and basic functionality.
 """
-import sys
+from win_console import fix_console_encoding
 
 # Fix Windows console encoding for Unicode characters
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+fix_console_encoding()
 
 from trello_client import TrelloClient
-import json
+import json_utils
 
 
 def print_json(data):
     """Pretty print JSON data."""
-    print(json.dumps(data, indent=2))
+    print(json_utils.dumps_pretty(data))
 
 
 def main():
@@ -1,20 +1,139 @@
 """
 Trello API client wrapper for interacting with Trello REST API v1.
 """
+import asyncio
 import os
-import requests
-from typing import Optional, List, Dict, Any
-from dotenv import load_dotenv
+import time
+import httpx
+import json_utils
+from typing import Optional, List, Dict, Any, Tuple
 
-load_dotenv()
+# Upper bound on concurrent outbound Trello requests (the API allows ~100 requests per 10s per key)
+TRELLO_MAX_CONCURRENCY = 20
 
 
-class TrelloClient:
-    """Wrapper for Trello API interactions."""
+class ConcurrencyLimiter:
+    """
+    Adaptive cap on concurrent requests.
+
+    The limit is halved whenever Trello answers 429 and grows back by one after
+    a full window of successful requests, so bursts queue up instead of failing.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_limit: Maximum number of requests in flight
+            min_limit: Floor the limit never drops below
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Record a successful request, raising the limit after a full window."""
+        self._successes += 1
+        if self._successes >= self.limit:
+            self._successes = 0
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    def on_throttled(self) -> None:
+        """Record a rate-limited request, halving the limit."""
+        self._successes = 0
+        self.limit = max(self.min_limit, self.limit // 2)
+
+
+_trello_limiter = ConcurrencyLimiter(TRELLO_MAX_CONCURRENCY)
+
+# Async HTTP client shared by every AsyncTrelloClient, so tool calls reuse pooled connections
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client for the Trello API, creating it on first use."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            base_url=_BaseTrelloClient.BASE_URL,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+            http2=True
+        )
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """Close the shared async HTTP client."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+class _BaseTrelloClient:
+    """Configuration and response shaping shared by the sync and async Trello clients."""
 
     BASE_URL = "https://api.trello.com/1"
 
+    # Nest each list's open card IDs in the lists response, so card counts need no extra requests
+    LIST_CARDS_PARAMS = {"cards": "open", "card_fields": "id"}
+
+    # Board cards, lists and labels as nested resources of one board request
+    SEARCH_BOARD_PARAMS = {
+        "fields": "id",
+        "cards": "open",
+        "card_fields": "id,name,desc,idList,idLabels,due,url",
+        "lists": "open",
+        "list_fields": "id,name",
+        "labels": "all",
+        "label_fields": "id,name"
+    }
+
+    # Most cards Trello's search endpoint returns per request
+    SEARCH_MAX_CARDS = 1000
+
+    # Nest the card's list, members and comments in the card request
+    CARD_DETAILS_PARAMS = {
+        "list": "true",
+        "list_fields": "name",
+        "members": "true",
+        "member_fields": "username",
+        "actions": "commentCard",
+        "action_fields": "date,data",
+        "action_memberCreator_fields": "username"
+    }
+
+    # Nest the list name in the card creation response
+    CREATED_CARD_PARAMS = {"list": "true", "list_fields": "name"}
+
+    # Seconds a board's label map is reused before fetching the labels again
+    LABEL_CACHE_TTL_SECONDS = 300
+
+    # .env is read once, by the first client created
+    _dotenv_loaded = False
+
     def __init__(self):
+        if not _BaseTrelloClient._dotenv_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _BaseTrelloClient._dotenv_loaded = True
+
         self.api_key = os.getenv("TRELLO_API_KEY")
         self.api_token = os.getenv("TRELLO_API_TOKEN")
         self.default_board_id = os.getenv("TRELLO_DEFAULT_BOARD_ID")
@@ -22,40 +141,37 @@ class TrelloClient:
         if not self.api_key or not self.api_token:
             raise ValueError("TRELLO_API_KEY and TRELLO_API_TOKEN must be set in environment")
 
-    def _get_auth_params(self) -> Dict[str, str]:
-        """Get authentication parameters for API requests."""
-        return {
+        self._auth_params = {
             "key": self.api_key,
             "token": self.api_token
         }
 
-    def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
-                     data: Optional[Dict] = None) -> Any:
-        """Make an authenticated request to Trello API."""
-        url = f"{self.BASE_URL}/{endpoint}"
-        auth_params = self._get_auth_params()
+        # Lowercase label name -> label ID per board, with the time it was fetched
+        self._label_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
 
-        if params:
-            params.update(auth_params)
-        else:
-            params = auth_params
+    def _get_cached_label_map(self, board_id: str) -> Optional[Dict[str, str]]:
+        """Get a board's label map if it was fetched within the cache TTL."""
+        hit = self._label_cache.get(board_id)
+        if hit is not None and time.monotonic() - hit[0] < self.LABEL_CACHE_TTL_SECONDS:
+            return hit[1]
+        return None
 
-        try:
-            if method == "GET":
-                response = requests.get(url, params=params, timeout=10)
-            elif method == "POST":
-                response = requests.post(url, params=params, json=data, timeout=10)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+    def _store_label_map(self, board_id: str, board_labels: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Build a board's label map from its labels and cache it."""
+        label_map = {lbl["name"].lower(): lbl["id"] for lbl in board_labels}
+        self._label_cache[board_id] = (time.monotonic(), label_map)
+        return label_map
 
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Trello API request failed: {str(e)}")
+    def _resolve_board_id(self, board_id: Optional[str]) -> str:
+        """Fall back to the default board when no board ID is given."""
+        board_id = board_id or self.default_board_id
+        if not board_id:
+            raise ValueError("board_id must be provided or TRELLO_DEFAULT_BOARD_ID must be set")
+        return board_id
 
-    def get_boards(self) -> List[Dict[str, Any]]:
-        """Get all boards for the authenticated user."""
-        boards = self._make_request("GET", "members/me/boards")
+    @staticmethod
+    def _format_boards(boards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reduce board objects to the fields exposed by the tools."""
         return [
             {
                 "id": board["id"],
@@ -65,68 +181,47 @@ class TrelloClient:
             for board in boards
         ]
 
-    def get_lists(self, board_id: str) -> List[Dict[str, Any]]:
-        """Get all lists in a board."""
-        lists = self._make_request("GET", f"boards/{board_id}/lists")
-
-        # Get card counts for each list
-        result = []
-        for lst in lists:
-            cards = self._make_request("GET", f"lists/{lst['id']}/cards")
-            result.append({
+    @staticmethod
+    def _format_lists(lists: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reduce lists with their nested cards to card counts."""
+        return [
+            {
                 "id": lst["id"],
                 "name": lst["name"],
-                "card_count": len(cards)
-            })
-
-        return result
-
-    def search_cards(self, board_id: Optional[str] = None, query: Optional[str] = None,
-                    list_name: Optional[str] = None, label: Optional[str] = None,
-                    limit: int = 10) -> Dict[str, Any]:
-        """
-        Search for cards based on various criteria.
-
-        Args:
-            board_id: Board to search in (defaults to default board)
-            query: Text search in card names and descriptions
-            list_name: Filter by list name
-            label: Filter by label name
-            limit: Maximum number of cards to return
-        """
-        board_id = board_id or self.default_board_id
-        if not board_id:
-            raise ValueError("board_id must be provided or TRELLO_DEFAULT_BOARD_ID must be set")
-
-        # Get all cards from the board
-        cards = self._make_request("GET", f"boards/{board_id}/cards")
+                "card_count": len(lst.get("cards", []))
+            }
+            for lst in lists
+        ]
 
-        # Get board lists for list name mapping
-        lists = self._make_request("GET", f"boards/{board_id}/lists")
+    @staticmethod
+    def _filter_cards(cards: List[Dict[str, Any]], lists: List[Dict[str, Any]],
+                      labels_data: List[Dict[str, Any]], list_name: Optional[str],
+                      label: Optional[str], limit: int) -> Dict[str, Any]:
+        """Apply the list and label filters to cards (text queries are matched by Trello's search)."""
         list_map = {lst["id"]: lst["name"] for lst in lists}
+        label_map = {lbl["id"]: lbl["name"] for lbl in labels_data}
+
+        # Without filters every card matches, so only the first `limit` need formatting
+        if not (list_name or label):
+            cards = cards[:limit]
 
-        # Get board labels for label mapping
-        labels_data = self._make_request("GET", f"boards/{board_id}/labels")
+        # Case-insensitive matching via casefold, which also folds non-ASCII case (e.g. "ß" -> "ss")
+        list_name_folded = list_name.casefold() if list_name else None
+        label_folded = label.casefold() if label else None
 
         # Filter cards based on criteria
         filtered_cards = []
         for card in cards:
             # Apply filters
-            if query and query.lower() not in card["name"].lower() and query.lower() not in card.get("desc", "").lower():
-                continue
-
             card_list_name = list_map.get(card["idList"], "")
-            if list_name and list_name.lower() not in card_list_name.lower():
+            if list_name_folded and list_name_folded not in card_list_name.casefold():
                 continue
 
             # Get card labels
-            card_label_names = []
-            for label_id in card.get("idLabels", []):
-                for lbl in labels_data:
-                    if lbl["id"] == label_id:
-                        card_label_names.append(lbl["name"])
+            card_label_names = [label_map[label_id] for label_id in card.get("idLabels", [])
+                                if label_id in label_map]
 
-            if label and not any(label.lower() in lbl.lower() for lbl in card_label_names):
+            if label_folded and not any(label_folded in lbl.casefold() for lbl in card_label_names):
                 continue
 
             # Add to results
@@ -148,38 +243,53 @@ class TrelloClient:
             "count": len(filtered_cards)
         }
 
-    def get_card_details(self, card_id: str) -> Dict[str, Any]:
-        """Get full details of a specific card."""
-        # Get card data
-        card = self._make_request("GET", f"cards/{card_id}")
-
-        # Get list name
-        list_data = self._make_request("GET", f"lists/{card['idList']}")
-        list_name = list_data["name"]
+    @classmethod
+    def _search_params(cls, board_id: str, query: str, list_name: Optional[str],
+                       label: Optional[str], limit: int) -> Dict[str, Any]:
+        """Build the search endpoint parameters for a card text search on one board."""
+        # List and label filters are applied afterwards, so fetch extra candidates for them
+        cards_limit = cls.SEARCH_MAX_CARDS if (list_name or label) else min(limit, cls.SEARCH_MAX_CARDS)
+        return {
+            "query": query,
+            "idBoards": board_id,
+            "modelTypes": "cards",
+            "partial": "true",
+            "cards_limit": cards_limit,
+            "card_fields": "id,name,desc,idList,idLabels,labels,due,url",
+            "card_list": "true"
+        }
 
+    @classmethod
+    def _filter_search_results(cls, cards: List[Dict[str, Any]], list_name: Optional[str],
+                               label: Optional[str], limit: int) -> Dict[str, Any]:
+        """Apply the list and label filters to cards returned by the search endpoint."""
+        lists = [card["list"] for card in cards if card.get("list")]
+        labels_data = [lbl for card in cards for lbl in card.get("labels", [])]
+        return cls._filter_cards(cards, lists, labels_data, list_name, label, limit)
+
+    @staticmethod
+    def _format_card_details(card: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a card with its nested list, members and comment actions to the details response."""
         # Get label names
         label_names = [label["name"] for label in card.get("labels", [])]
 
         # Get members
         members = [member["username"] for member in card.get("members", [])]
 
-        # Get comments (actions of type commentCard)
-        actions = self._make_request("GET", f"cards/{card_id}/actions",
-                                     params={"filter": "commentCard"})
         comments = [
             {
                 "date": action["date"],
                 "author": action["memberCreator"]["username"],
                 "text": action["data"]["text"]
             }
-            for action in actions
+            for action in card.get("actions", [])
         ]
 
         return {
             "id": card["id"],
             "name": card["name"],
             "desc": card.get("desc", ""),
-            "list_name": list_name,
+            "list_name": card["list"]["name"],
             "labels": label_names,
             "due": card.get("due"),
             "members": members,
@@ -188,6 +298,119 @@ class TrelloClient:
             "url": card.get("url", "")
         }
 
+    @staticmethod
+    def _build_card_data(list_id: str, name: str, desc: str, due: Optional[str],
+                         label_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Prepare the request body for creating a card."""
+        card_data = {
+            "idList": list_id,
+            "name": name,
+            "desc": desc
+        }
+
+        if due:
+            card_data["due"] = due
+
+        if label_ids:
+            card_data["idLabels"] = ",".join(label_ids)
+
+        return card_data
+
+    @staticmethod
+    def _match_label_ids(label_map: Dict[str, str], labels: List[str]) -> List[str]:
+        """Resolve label names to the IDs of matching board labels."""
+        return [label_map[name.lower()] for name in labels if name.lower() in label_map]
+
+    @staticmethod
+    def _format_created_card(card: Dict[str, Any], list_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the create_card response."""
+        return {
+            "success": True,
+            "card": {
+                "id": card["id"],
+                "name": card["name"],
+                "url": card.get("url", ""),
+                "list_name": list_data["name"]
+            }
+        }
+
+
+class TrelloClient(_BaseTrelloClient):
+    """Wrapper for Trello API interactions."""
+
+    def __init__(self):
+        super().__init__()
+
+        # requests is only imported by the sync client, so the MCP server never loads it
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self._request_error = requests.exceptions.RequestException
+
+        # Reuse connections across sync requests and attach auth to each of them;
+        # idempotent requests are retried on rate limits and transient server errors
+        self._session = requests.Session()
+        self._session.params = self._auth_params
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry))
+
+    def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                     data: Optional[Dict] = None) -> Any:
+        """Make an authenticated request to Trello API."""
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported method: {method}")
+
+        try:
+            response = self._session.request(method, f"{self.BASE_URL}/{endpoint}",
+                                             params=params, json=data, timeout=10)
+            response.raise_for_status()
+            return json_utils.loads(response.content)
+        except self._request_error as e:
+            raise Exception(f"Trello API request failed: {str(e)}")
+
+    def get_boards(self) -> List[Dict[str, Any]]:
+        """Get all boards for the authenticated user."""
+        boards = self._make_request("GET", "members/me/boards")
+        return self._format_boards(boards)
+
+    def get_lists(self, board_id: str) -> List[Dict[str, Any]]:
+        """Get all lists in a board."""
+        lists = self._make_request("GET", f"boards/{board_id}/lists", params=self.LIST_CARDS_PARAMS)
+        return self._format_lists(lists)
+
+    def search_cards(self, board_id: Optional[str] = None, query: Optional[str] = None,
+                    list_name: Optional[str] = None, label: Optional[str] = None,
+                    limit: int = 10) -> Dict[str, Any]:
+        """
+        Search for cards based on various criteria.
+
+        Args:
+            board_id: Board to search in (defaults to default board)
+            query: Text search in card names and descriptions
+            list_name: Filter by list name
+            label: Filter by label name
+            limit: Maximum number of cards to return
+        """
+        board_id = self._resolve_board_id(board_id)
+
+        if query:
+            # Let Trello match the text and only download matching cards
+            results = self._make_request("GET", "search",
+                                         params=self._search_params(board_id, query, list_name, label, limit))
+            return self._filter_search_results(results["cards"], list_name, label, limit)
+
+        # Get the board's cards with its lists and labels for name mapping
+        board = self._make_request("GET", f"boards/{board_id}", params=self.SEARCH_BOARD_PARAMS)
+
+        return self._filter_cards(board["cards"], board["lists"], board["labels"],
+                                  list_name, label, limit)
+
+    def get_card_details(self, card_id: str) -> Dict[str, Any]:
+        """Get full details of a specific card."""
+        card = self._make_request("GET", f"cards/{card_id}", params=self.CARD_DETAILS_PARAMS)
+        return self._format_card_details(card)
+
     def create_card(self, board_id: Optional[str], list_id: str, name: str,
                    desc: str = "", labels: Optional[List[str]] = None,
                    due: Optional[str] = None) -> Dict[str, Any]:
@@ -202,45 +425,119 @@ class TrelloClient:
             labels: List of label names to apply
             due: Due date (ISO format string)
         """
-        board_id = board_id or self.default_board_id
-        if not board_id:
-            raise ValueError("board_id must be provided or TRELLO_DEFAULT_BOARD_ID must be set")
+        board_id = self._resolve_board_id(board_id)
 
-        # Prepare card data
-        card_data = {
-            "idList": list_id,
-            "name": name,
-            "desc": desc
-        }
-
-        if due:
-            card_data["due"] = due
+        # Resolve label names so the labels are set when the card is created
+        label_ids = []
+        if labels:
+            label_ids = self._match_label_ids(self._get_label_map(board_id), labels)
 
         # Create card
-        card = self._make_request("POST", "cards", data=card_data)
+        card = self._make_request("POST", "cards", params=self.CREATED_CARD_PARAMS,
+                                  data=self._build_card_data(list_id, name, desc, due, label_ids))
+
+        # Get list name for response if it wasn't nested
+        list_data = card.get("list") or self._make_request("GET", f"lists/{list_id}")
+
+        return self._format_created_card(card, list_data)
+
+    def _get_label_map(self, board_id: str) -> Dict[str, str]:
+        """Get a board's lowercase label name -> label ID map, fetching it if not cached."""
+        label_map = self._get_cached_label_map(board_id)
+        if label_map is None:
+            board_labels = self._make_request("GET", f"boards/{board_id}/labels", params={"fields": "id,name"})
+            label_map = self._store_label_map(board_id, board_labels)
+        return label_map
+
+
+class AsyncTrelloClient(_BaseTrelloClient):
+    """
+    Async wrapper for Trello API interactions.
+
+    Requests go through the shared pooled HTTP client and the concurrency limiter,
+    so the MCP server's tool handlers never block the event loop.
+    """
+
+    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                            data: Optional[Dict] = None) -> Any:
+        """Make an authenticated request to Trello API without blocking the event loop."""
+        client = get_async_client()
+        params = {**params, **self._auth_params} if params else self._auth_params
+
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported method: {method}")
+
+        try:
+            async with _trello_limiter:
+                if method == "GET":
+                    response = await client.get(f"/{endpoint}", params=params)
+                else:
+                    response = await client.post(f"/{endpoint}", params=params, json=data)
+
+            if response.status_code == 429:
+                _trello_limiter.on_throttled()
+            else:
+                _trello_limiter.on_success()
+
+            response.raise_for_status()
+            return json_utils.loads(response.content)
+        except httpx.HTTPError as e:
+            raise Exception(f"Trello API request failed: {str(e)}")
 
-        # Add labels if specified
+    async def get_boards(self) -> List[Dict[str, Any]]:
+        """Get all boards for the authenticated user."""
+        boards = await self._make_request("GET", "members/me/boards")
+        return self._format_boards(boards)
+
+    async def get_lists(self, board_id: str) -> List[Dict[str, Any]]:
+        """Get all lists in a board."""
+        lists = await self._make_request("GET", f"boards/{board_id}/lists", params=self.LIST_CARDS_PARAMS)
+        return self._format_lists(lists)
+
+    async def search_cards(self, board_id: Optional[str] = None, query: Optional[str] = None,
+                           list_name: Optional[str] = None, label: Optional[str] = None,
+                           limit: int = 10) -> Dict[str, Any]:
+        """Search for cards based on various criteria (see TrelloClient.search_cards)."""
+        board_id = self._resolve_board_id(board_id)
+
+        if query:
+            results = await self._make_request(
+                "GET", "search", params=self._search_params(board_id, query, list_name, label, limit)
+            )
+            return self._filter_search_results(results["cards"], list_name, label, limit)
+
+        board = await self._make_request("GET", f"boards/{board_id}", params=self.SEARCH_BOARD_PARAMS)
+
+        return self._filter_cards(board["cards"], board["lists"], board["labels"],
+                                  list_name, label, limit)
+
+    async def get_card_details(self, card_id: str) -> Dict[str, Any]:
+        """Get full details of a specific card."""
+        card = await self._make_request("GET", f"cards/{card_id}", params=self.CARD_DETAILS_PARAMS)
+        return self._format_card_details(card)
+
+    async def create_card(self, board_id: Optional[str], list_id: str, name: str,
+                          desc: str = "", labels: Optional[List[str]] = None,
+                          due: Optional[str] = None) -> Dict[str, Any]:
+        """Create a new Trello card (see TrelloClient.create_card)."""
+        board_id = self._resolve_board_id(board_id)
+
+        label_ids = []
         if labels:
-            # Get board labels
-            board_labels = self._make_request("GET", f"boards/{board_id}/labels")
-            label_map = {lbl["name"].lower(): lbl["id"] for lbl in board_labels}
+            label_ids = self._match_label_ids(await self._get_label_map(board_id), labels)
 
-            # Add matching labels to card
-            for label_name in labels:
-                label_id = label_map.get(label_name.lower())
-                if label_id:
-                    self._make_request("POST", f"cards/{card['id']}/idLabels",
-                                      params={"value": label_id})
+        card = await self._make_request("POST", "cards", params=self.CREATED_CARD_PARAMS,
+                                        data=self._build_card_data(list_id, name, desc, due, label_ids))
 
-        # Get list name for response
-        list_data = self._make_request("GET", f"lists/{list_id}")
+        list_data = card.get("list") or await self._make_request("GET", f"lists/{list_id}")
 
-        return {
-            "success": True,
-            "card": {
-                "id": card["id"],
-                "name": card["name"],
-                "url": card.get("url", ""),
-                "list_name": list_data["name"]
-            }
-        }
+        return self._format_created_card(card, list_data)
+
+    async def _get_label_map(self, board_id: str) -> Dict[str, str]:
+        """Get a board's lowercase label name -> label ID map, fetching it if not cached."""
+        label_map = self._get_cached_label_map(board_id)
+        if label_map is None:
+            board_labels = await self._make_request("GET", f"boards/{board_id}/labels",
+                                                    params={"fields": "id,name"})
+            label_map = self._store_label_map(board_id, board_labels)
+        return label_map
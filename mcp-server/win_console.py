@@ -0,0 +1,11 @@
+"""
+Console helpers for the command-line scripts.
+"""
+import sys
+
+
+def fix_console_encoding() -> None:
+    """Switch stdout and stderr to UTF-8 on Windows so Unicode status symbols print."""
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')